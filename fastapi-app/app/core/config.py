@@ -31,6 +31,21 @@ class Settings(BaseSettings):
     # База данных (опционально, для будущего расширения)
     DATABASE_URL: Optional[str] = None
     
+    # Профилирование (по умолчанию выключено)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.01
+    PROFILING_SLOW_REQUEST_MS: float = 500.0
+    PROFILING_MAX_SECONDS: int = 60
+    PROFILING_ADMIN_TOKEN: Optional[str] = None
+    
+    # Удаление истекших items
+    EXPIRY_SWEEP_INTERVAL_SECONDS: float = 1.0
+    EXPIRY_SWEEP_BATCH_SIZE: int = 500
+    
+    # Кэш Idempotency-Key для создания items
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+    IDEMPOTENCY_TTL_SECONDS: float = 3600.0
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -2,8 +2,11 @@
 Модуль для работы с базой данных
 Пока используется in-memory хранилище, можно расширить для реальной БД
 """
-from typing import Dict, List, Optional
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
 from app.schemas.items import ItemCreate, ItemUpdate, Item
+from app.core.profiling import traced
 
 
 # In-memory хранилище (для примера)
@@ -11,21 +14,65 @@ from app.schemas.items import ItemCreate, ItemUpdate, Item
 _items_db: Dict[int, Item] = {}
 _next_id: int = 1
 
+# Индекс истечения срока: актуальный timestamp истечения по ID
+# и min-heap (timestamp, ID). Устаревшие записи heap пропускаются при извлечении,
+# а при их накоплении heap пересобирается из актуальных сроков.
+_expires_at: Dict[int, float] = {}
+_expiry_heap: List[Tuple[float, int]] = []
+
+
+def _compact_expiry_heap() -> None:
+    """Пересобрать heap из актуальных сроков, если устаревших записей слишком много"""
+    if len(_expiry_heap) > 2 * len(_expires_at) + 64:
+        _expiry_heap[:] = [(expires_ts, item_id) for item_id, expires_ts in _expires_at.items()]
+        heapq.heapify(_expiry_heap)
+
+
+def _set_expiry(item_id: int, item: Item) -> None:
+    """Обновить индекс истечения для item"""
+    if item.expires_at is None:
+        if _expires_at.pop(item_id, None) is not None:
+            _compact_expiry_heap()
+        return
+    expires_ts = item.expires_at.timestamp()
+    if _expires_at.get(item_id) == expires_ts:
+        return
+    _expires_at[item_id] = expires_ts
+    heapq.heappush(_expiry_heap, (expires_ts, item_id))
+    _compact_expiry_heap()
+
+
+def _is_expired(item_id: int, now: float) -> bool:
+    """Проверить, истек ли срок item"""
+    expires_ts = _expires_at.get(item_id)
+    return expires_ts is not None and expires_ts <= now
+
 
 class Database:
     """Класс для работы с данными"""
     
     @staticmethod
+    @traced("database.get_all_items")
     def get_all_items() -> List[Item]:
-        """Получить все items"""
-        return list(_items_db.values())
+        """Получить все items (кроме истекших)"""
+        if not _expires_at:
+            return list(_items_db.values())
+        now = time.time()
+        return [
+            item for item_id, item in _items_db.items()
+            if not _is_expired(item_id, now)
+        ]
     
     @staticmethod
+    @traced("database.get_item_by_id")
     def get_item_by_id(item_id: int) -> Optional[Item]:
         """Получить item по ID"""
+        if _is_expired(item_id, time.time()):
+            return None
         return _items_db.get(item_id)
     
     @staticmethod
+    @traced("database.create_item")
     def create_item(item: ItemCreate) -> Item:
         """Создать новый item"""
         global _next_id
@@ -34,36 +81,66 @@ class Database:
             name=item.name,
             description=item.description,
             price=item.price,
-            is_available=item.is_available
+            is_available=item.is_available,
+            expires_at=item.expires_at
         )
         _items_db[_next_id] = new_item
+        _set_expiry(_next_id, new_item)
         _next_id += 1
         return new_item
     
     @staticmethod
+    @traced("database.update_item")
     def update_item(item_id: int, item_update: ItemUpdate) -> Optional[Item]:
         """Обновить item"""
-        if item_id not in _items_db:
+        if item_id not in _items_db or _is_expired(item_id, time.time()):
             return None
         
         existing_item = _items_db[item_id]
         update_data = item_update.model_dump(exclude_unset=True)
         updated_item = existing_item.model_copy(update=update_data)
         _items_db[item_id] = updated_item
+        if "expires_at" in update_data:
+            _set_expiry(item_id, updated_item)
         return updated_item
     
     @staticmethod
+    @traced("database.delete_item")
     def delete_item(item_id: int) -> bool:
         """Удалить item"""
         if item_id in _items_db:
+            expired = _is_expired(item_id, time.time())
             del _items_db[item_id]
-            return True
+            if _expires_at.pop(item_id, None) is not None:
+                _compact_expiry_heap()
+            return not expired
         return False
     
+    @staticmethod
+    def delete_expired(limit: int) -> int:
+        """
+        Обработать не более `limit` истекших записей индекса,
+        вернуть число обработанных записей.
+        Стоимость зависит от числа истекших записей, а не от размера хранилища.
+        """
+        now = time.time()
+        processed = 0
+        while _expiry_heap and processed < limit and _expiry_heap[0][0] <= now:
+            expires_ts, item_id = heapq.heappop(_expiry_heap)
+            processed += 1
+            # Запись устарела: item удален или срок изменен
+            if _expires_at.get(item_id) != expires_ts:
+                continue
+            del _items_db[item_id]
+            del _expires_at[item_id]
+        return processed
+    
     @staticmethod
     def clear_all() -> None:
         """Очистить все items (для тестирования)"""
         global _next_id
         _items_db.clear()
+        _expires_at.clear()
+        _expiry_heap.clear()
         _next_id = 1
 
@@ -0,0 +1,24 @@
+"""
+Фоновое удаление истекших items
+"""
+import asyncio
+import logging
+from app.core.database import Database
+
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_expired_items(interval: float, batch_size: int) -> None:
+    """
+    Периодически удалять истекшие items пакетами по `batch_size`.
+    Между пакетами управление возвращается event loop,
+    поэтому удаление не блокирует обработку запросов.
+    """
+    while True:
+        try:
+            while Database.delete_expired(batch_size) > 0:
+                await asyncio.sleep(0)
+        except Exception:
+            logger.exception("Expired items sweep failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,129 @@
+"""
+Кэш идемпотентных запросов
+Хранит исходные байты ответа по Idempotency-Key, ограничен по размеру
+и времени жизни записей. Одновременные запросы с одним ключом
+объединяются: запись выполняет только первый, остальные ждут его результата.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Tuple
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+
+@dataclass
+class CachedResponse:
+    """Сохраненный ответ"""
+    status_code: int
+    body: bytes
+    fingerprint: str
+    expires_at: float
+
+
+class IdempotencyCache:
+    """Ограниченный кэш ответов с TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # TTL одинаковый для всех записей, поэтому порядок вставки
+        # совпадает с порядком истечения
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+    def _evict(self, now: float) -> None:
+        """Удалить истекшие записи и записи сверх лимита"""
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest.expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _check_fingerprint(expected: str, actual: str) -> None:
+        """Ключ нельзя переиспользовать с другим телом запроса"""
+        if expected != actual:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        produce: Callable[[], Awaitable[Tuple[int, bytes]]],
+    ) -> Tuple[CachedResponse, bool]:
+        """
+        Вернуть сохраненный ответ для ключа или выполнить `produce`.
+        Второй элемент результата — признак повторного ответа из кэша.
+        """
+        while True:
+            self._evict(time.monotonic())
+
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._check_fingerprint(cached.fingerprint, fingerprint)
+                return cached, True
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                return await self._produce(key, fingerprint, produce)
+
+            in_flight_fingerprint, future = in_flight
+            self._check_fingerprint(in_flight_fingerprint, fingerprint)
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # Отменен сам ожидающий запрос, а не выполняющий запись
+                if not future.cancelled():
+                    raise
+                # Выполняющий запись запрос отменен: повторить попытку,
+                # один из ожидающих станет новым исполнителем
+
+    async def _produce(
+        self,
+        key: str,
+        fingerprint: str,
+        produce: Callable[[], Awaitable[Tuple[int, bytes]]],
+    ) -> Tuple[CachedResponse, bool]:
+        """Выполнить запись и сохранить ответ, оповестив ожидающих"""
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = (fingerprint, future)
+        try:
+            status_code, body = await produce()
+        except Exception as exc:
+            # Ошибки не кэшируются: ожидающие получают то же исключение,
+            # следующий запрос с этим ключом выполнит запись заново
+            future.set_exception(exc)
+            # Исключение уже пробрасывается, ожидающих может не быть
+            future.exception()
+            raise
+        else:
+            cached = CachedResponse(
+                status_code=status_code,
+                body=body,
+                fingerprint=fingerprint,
+                expires_at=time.monotonic() + self.ttl,
+            )
+            self._entries[key] = cached
+            self._evict(time.monotonic())
+            future.set_result(cached)
+            return cached, False
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._in_flight[key]
+
+    def clear(self) -> None:
+        """Очистить кэш (для тестирования)"""
+        self._entries.clear()
+
+
+# Глобальный экземпляр кэша
+idempotency_cache = IdempotencyCache(
+    max_entries=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+)
@@ -0,0 +1,179 @@
+"""
+Профилирование запросов
+Тайминги (spans) по слоям router → service → database,
+логирование медленных запросов и семплирующий профайлер стеков.
+При выключенном профилировании накладные расходы сводятся к одному
+чтению ContextVar на вызов.
+"""
+import functools
+import inspect
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Список spans текущего запроса: (имя, глубина, длительность в секундах).
+# None означает, что профилирование выключено и ничего не записывается.
+_current_trace: ContextVar[Optional[List[Tuple[str, int, float]]]] = ContextVar(
+    "current_trace", default=None
+)
+_current_depth: ContextVar[int] = ContextVar("current_depth", default=0)
+
+
+def traced(name: str) -> Callable:
+    """Декоратор: записать span для вызова, если профилирование включено"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                trace = _current_trace.get()
+                if trace is None:
+                    return await func(*args, **kwargs)
+                depth = _current_depth.get()
+                token = _current_depth.set(depth + 1)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    trace.append((name, depth, time.perf_counter() - start))
+                    _current_depth.reset(token)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            depth = _current_depth.get()
+            token = _current_depth.set(depth + 1)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                trace.append((name, depth, time.perf_counter() - start))
+                _current_depth.reset(token)
+        return wrapper
+    return decorator
+
+
+def format_breakdown(trace: List[Tuple[str, int, float]], total: float) -> str:
+    """Сводка spans по именам: суммарное время и количество вызовов"""
+    totals: dict = {}
+    order: List[str] = []
+    for name, depth, duration in sorted(trace, key=lambda span: span[1]):
+        if name not in totals:
+            totals[name] = [0.0, 0]
+            order.append(name)
+        totals[name][0] += duration
+        totals[name][1] += 1
+
+    # Время вне endpoint: middleware, валидация запроса Pydantic
+    # и сериализация ответа (отдельно не измеряются)
+    top_level = sum(duration for _, depth, duration in trace if depth == 0)
+    parts = [
+        f"{name}={totals[name][0] * 1000:.2f}ms(x{totals[name][1]})"
+        for name in order
+    ]
+    parts.append(f"framework={max(total - top_level, 0.0) * 1000:.2f}ms")
+    return " ".join(parts)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware для профилирования запросов.
+    Spans собираются для каждого запроса; запросы медленнее порога
+    логируются с разбивкой по spans, доля `sample_rate` остальных
+    запросов логируется на уровне INFO.
+    """
+
+    def __init__(self, app, sample_rate: float, slow_request_ms: float):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_s = slow_request_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace: List[Tuple[str, int, float]] = []
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            total = time.perf_counter() - start
+            _current_trace.reset(token)
+            if total >= self.slow_request_s:
+                logger.warning(
+                    "Slow request %s %s: %.2fms [%s]",
+                    scope["method"],
+                    scope["path"],
+                    total * 1000,
+                    format_breakdown(trace, total),
+                )
+            elif self.sample_rate > 0 and random.random() < self.sample_rate:
+                logger.info(
+                    "Request %s %s: %.2fms [%s]",
+                    scope["method"],
+                    scope["path"],
+                    total * 1000,
+                    format_breakdown(trace, total),
+                )
+
+
+class ProfilerBusyError(RuntimeError):
+    """Семплирующий профайлер уже запущен"""
+
+
+class StackSampler:
+    """
+    Семплирующий профайлер: периодически снимает стеки всех потоков
+    и агрегирует их в collapsed-формат (flamegraph.pl, speedscope)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def run(self, seconds: float, interval: float) -> str:
+        """Семплировать стеки `seconds` секунд, вернуть collapsed-профиль"""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Profiler is already running")
+        try:
+            return self._sample(seconds, interval)
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _sample(seconds: float, interval: float) -> str:
+        own_thread = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                thread_name = thread_names.get(thread_id, str(thread_id))
+                frames.append(thread_name)
+                stacks[";".join(reversed(frames))] += 1
+            time.sleep(interval)
+
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+
+
+# Глобальный экземпляр профайлера
+stack_sampler = StackSampler()
@@ -1,12 +1,34 @@
 """
 Главный файл FastAPI приложения
 """
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.expiry import sweep_expired_items
+from app.core.profiling import ProfilingMiddleware
+from app.routers.admin import router as admin_router
 from app.routers.items import router as items_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Запуск и остановка фоновых задач"""
+    sweeper = asyncio.create_task(
+        sweep_expired_items(
+            settings.EXPIRY_SWEEP_INTERVAL_SECONDS,
+            settings.EXPIRY_SWEEP_BATCH_SIZE,
+        )
+    )
+    yield
+    sweeper.cancel()
+    try:
+        await sweeper
+    except asyncio.CancelledError:
+        pass
+
+
 # Создание экземпляра FastAPI приложения
 app = FastAPI(
     title=settings.APP_NAME,
@@ -14,7 +36,8 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # Настройка CORS
@@ -26,8 +49,18 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
+# Профилирование запросов (opt-in)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        slow_request_ms=settings.PROFILING_SLOW_REQUEST_MS,
+    )
+
 # Подключение роутеров
 app.include_router(items_router, prefix="/api/v1", tags=["items"])
+if settings.PROFILING_ENABLED and settings.PROFILING_ADMIN_TOKEN:
+    app.include_router(admin_router)
 
 
 @app.get("/", tags=["root"])
@@ -0,0 +1,54 @@
+"""
+Роутер административных endpoints
+"""
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.profiling import ProfilerBusyError, stack_sampler
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+)
+
+
+@router.post(
+    "/profile",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Снять профиль приложения",
+    description=(
+        "Запускает семплирующий профайлер на заданное число секунд и "
+        "возвращает профиль в collapsed-формате (flamegraph.pl, speedscope)"
+    )
+)
+async def profile(
+    seconds: float = Query(5.0, gt=0, le=settings.PROFILING_MAX_SECONDS),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+    x_admin_token: Optional[str] = Header(None),
+) -> PlainTextResponse:
+    """Снять профиль приложения"""
+    # Без настроенного токена endpoint недоступен
+    if not settings.PROFILING_ADMIN_TOKEN or not secrets.compare_digest(
+        (x_admin_token or "").encode(), settings.PROFILING_ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token"
+        )
+
+    # Семплирование идет в отдельном потоке, event loop продолжает обслуживать запросы
+    try:
+        collapsed = await run_in_threadpool(
+            stack_sampler.run, seconds, interval_ms / 1000
+        )
+    except ProfilerBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profiler is already running"
+        )
+
+    return PlainTextResponse(collapsed)
@@ -1,8 +1,8 @@
 """
 Роутер для работы с Items
 """
-from fastapi import APIRouter, status
-from typing import List
+from fastapi import APIRouter, Header, Response, status
+from typing import List, Optional
 from app.schemas.items import (
     Item,
     ItemCreate,
@@ -11,6 +11,8 @@ from app.schemas.items import (
     ItemsListResponse
 )
 from app.services.items_service import ItemsService
+from app.core.profiling import traced
+from app.core.idempotency import idempotency_cache
 
 router = APIRouter(
     prefix="/items",
@@ -26,6 +28,7 @@ router = APIRouter(
     summary="Получить все items",
     description="Возвращает список всех доступных items"
 )
+@traced("router.get_items")
 async def get_items() -> ItemsListResponse:
     """Получить все items"""
     items = ItemsService.get_all_items()
@@ -43,6 +46,7 @@ async def get_items() -> ItemsListResponse:
     summary="Получить item по ID",
     description="Возвращает информацию о конкретном item"
 )
+@traced("router.get_item")
 async def get_item(item_id: int) -> ItemResponse:
     """Получить item по ID"""
     item = ItemsService.get_item_by_id(item_id)
@@ -57,14 +61,40 @@ async def get_item(item_id: int) -> ItemResponse:
     response_model=ItemResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Создать новый item",
-    description="Создает новый item в системе"
+    description=(
+        "Создает новый item в системе. При повторе запроса с тем же "
+        "заголовком Idempotency-Key возвращается исходный ответ без повторной записи"
+    )
 )
-async def create_item(item: ItemCreate) -> ItemResponse:
+@traced("router.create_item")
+async def create_item(
+    item: ItemCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+) -> ItemResponse:
     """Создать новый item"""
-    new_item = ItemsService.create_item(item)
-    return ItemResponse(
-        item=new_item,
-        message="Item created successfully"
+    if idempotency_key is None:
+        new_item = ItemsService.create_item(item)
+        return ItemResponse(
+            item=new_item,
+            message="Item created successfully"
+        )
+
+    async def produce() -> tuple[int, bytes]:
+        new_item = ItemsService.create_item(item)
+        response = ItemResponse(
+            item=new_item,
+            message="Item created successfully"
+        )
+        return status.HTTP_201_CREATED, response.model_dump_json().encode()
+
+    cached, replayed = await idempotency_cache.run(
+        idempotency_key, item.model_dump_json(), produce
+    )
+    return Response(
+        content=cached.body,
+        status_code=cached.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true" if replayed else "false"}
     )
 
 
@@ -75,6 +105,7 @@ async def create_item(item: ItemCreate) -> ItemResponse:
     summary="Обновить item",
     description="Обновляет информацию о существующем item"
 )
+@traced("router.update_item")
 async def update_item(item_id: int, item_update: ItemUpdate) -> ItemResponse:
     """Обновить item"""
     updated_item = ItemsService.update_item(item_id, item_update)
@@ -90,6 +121,7 @@ async def update_item(item_id: int, item_update: ItemUpdate) -> ItemResponse:
     summary="Удалить item",
     description="Удаляет item из системы"
 )
+@traced("router.delete_item")
 async def delete_item(item_id: int) -> dict:
     """Удалить item"""
     return ItemsService.delete_item(item_id)
@@ -12,6 +12,7 @@ class ItemBase(BaseModel):
     description: Optional[str] = Field(None, max_length=500, description="Описание товара")
     price: float = Field(..., gt=0, description="Цена товара")
     is_available: bool = Field(True, description="Доступность товара")
+    expires_at: Optional[datetime] = Field(None, description="Дата истечения срока действия")
 
 
 class ItemCreate(ItemBase):
@@ -25,6 +26,7 @@ class ItemUpdate(BaseModel):
     description: Optional[str] = Field(None, max_length=500)
     price: Optional[float] = Field(None, gt=0)
     is_available: Optional[bool] = None
+    expires_at: Optional[datetime] = None
 
 
 class Item(ItemBase):
@@ -41,6 +43,7 @@ class Item(ItemBase):
                 "description": "Описание товара",
                 "price": 99.99,
                 "is_available": True,
+                "expires_at": None,
                 "created_at": "2024-01-01T00:00:00"
             }
         }
@@ -2,21 +2,37 @@
 Сервисный слой для работы с Items
 Содержит бизнес-логику приложения
 """
+from datetime import datetime, timezone
 from typing import List, Optional
 from fastapi import HTTPException, status
 from app.schemas.items import Item, ItemCreate, ItemUpdate
 from app.core.database import Database
+from app.core.profiling import traced
+
+
+def _validate_expires_at(expires_at: Optional[datetime]) -> None:
+    """Проверить, что срок истечения в будущем"""
+    if expires_at is None:
+        return
+    now = datetime.now(timezone.utc) if expires_at.tzinfo else datetime.now()
+    if expires_at <= now:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="expires_at must be in the future"
+        )
 
 
 class ItemsService:
     """Сервис для работы с Items"""
     
     @staticmethod
+    @traced("service.get_all_items")
     def get_all_items() -> List[Item]:
         """Получить все items"""
         return Database.get_all_items()
     
     @staticmethod
+    @traced("service.get_item_by_id")
     def get_item_by_id(item_id: int) -> Item:
         """Получить item по ID"""
         item = Database.get_item_by_id(item_id)
@@ -28,6 +44,7 @@ class ItemsService:
         return item
     
     @staticmethod
+    @traced("service.create_item")
     def create_item(item_data: ItemCreate) -> Item:
         """Создать новый item"""
         # Здесь можно добавить бизнес-логику (валидация, проверки и т.д.)
@@ -36,10 +53,12 @@ class ItemsService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Price must be greater than 0"
             )
+        _validate_expires_at(item_data.expires_at)
         
         return Database.create_item(item_data)
     
     @staticmethod
+    @traced("service.update_item")
     def update_item(item_id: int, item_update: ItemUpdate) -> Item:
         """Обновить item"""
         # Проверяем существование
@@ -56,6 +75,7 @@ class ItemsService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Price must be greater than 0"
             )
+        _validate_expires_at(item_update.expires_at)
         
         updated_item = Database.update_item(item_id, item_update)
         if not updated_item:
@@ -67,6 +87,7 @@ class ItemsService:
         return updated_item
     
     @staticmethod
+    @traced("service.delete_item")
     def delete_item(item_id: int) -> dict:
         """Удалить item"""
         # Проверяем существование